@@ -9,13 +9,19 @@ https://docs.djangoproject.com/en/3.2/topics/settings/
 For the full list of settings and their values, see
 https://docs.djangoproject.com/en/3.2/ref/settings/
 """
+import logging
 import os
+import sys
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 
+# True when running the test suite through `manage.py test`
+TESTING = sys.argv[1:2] == ['test']
+
+
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/3.2/howto/deployment/checklist/
 
@@ -139,3 +145,24 @@ AUTH_USER_MODEL = 'core.User'
 REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
 }
+
+
+# Test settings
+# Only applied when running `manage.py test`, never in development or production
+
+if TESTING:
+    # The default PBKDF2 hasher is deliberately slow, which dominates the cost of every create_user call in tests
+    PASSWORD_HASHERS = [
+        'django.contrib.auth.hashers.MD5PasswordHasher',
+    ]
+    # Tests only use portable ORM features, so run them against SQLite which Django keeps in memory.
+    # The test database is built straight from the models instead of replaying every migration.
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': ':memory:',
+            'TEST': {'MIGRATE': False},
+        }
+    }
+    # The test runner already forces DEBUG off; also skip formatting the warnings logged for every 4xx response
+    logging.disable(logging.CRITICAL)
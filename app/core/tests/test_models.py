@@ -6,12 +6,14 @@ from django.test import TestCase
 from django.contrib.auth import get_user_model
 from core import models
 
+User = get_user_model()
+
 
 def create_user(email='user@example.com', password='testpass123'):
     """
     Create and return a new user
     """
-    return get_user_model().objects.create_user(email, password)
+    return User.objects.create_user(email, password)
 
 
 class ModelTests(TestCase):
@@ -24,7 +26,7 @@ class ModelTests(TestCase):
         """
         email = 'wongungurra@evhc.com'
         password = 'wongy'
-        user = get_user_model().objects.create_user(email=email, password=password)
+        user = User.objects.create_user(email=email, password=password)
 
         self.assertEqual(user.email, email)
         # can't check the pw string directly as it's stored as a hash
@@ -41,22 +43,26 @@ class ModelTests(TestCase):
                          ['test5@example.COM', 'test5@example.com'],
                          ['test6@example.com', 'test6@example.com']]
 
+        # normalisation itself doesn't need the DB, so only go through create_user once
         for email, expected_email in sample_emails:
-            user = get_user_model().objects.create_user(email=email, password='wongy')
-            self.assertEqual(user.email, expected_email)
+            self.assertEqual(User.objects.normalize_email(email), expected_email)
+
+        email, expected_email = sample_emails[0]
+        user = User.objects.create_user(email=email, password='wongy')
+        self.assertEqual(user.email, expected_email)
 
     def test_new_user_without_email_raises_error(self):
         """
         Tests that creating a user without supplying an email address raises ValueError
         """
         with self.assertRaises(ValueError):
-            get_user_model().objects.create_user('', password='wongy')
+            User.objects.create_user('', password='wongy')
 
     def test_create_superuser(self):
         """
         Test that a superuser can be correctly created
         """
-        user = get_user_model().objects.create_superuser(email='andor@ferrix.com', password='wongy')
+        user = User.objects.create_superuser(email='andor@ferrix.com', password='wongy')
         self.assertTrue(user.is_superuser)
         self.assertTrue(user.is_staff)
 
@@ -64,7 +70,7 @@ class ModelTests(TestCase):
         """
         Test creating a recipe is successful
         """
-        user = get_user_model().objects.create_user(email='test@example.com', password='test123')
+        user = User.objects.create_user(email='test@example.com', password='test123')
         recipe = models.Recipe.objects.create(
             user=user,
             title='Sample Recipe',
@@ -1,7 +1,7 @@
 from decimal import Decimal
 from django.contrib.auth import get_user_model
 from django.urls import reverse
-from django.test import TestCase
+from django.test import SimpleTestCase, TestCase
 
 from rest_framework import status
 from rest_framework.test import APIClient
@@ -10,13 +10,14 @@ from core.models import Ingredient, Recipe
 from recipe.serializers import IngredientSerializer
 
 INGREDIENTS_URL = reverse('recipe:ingredient-list')
+INGREDIENT_DETAIL_URL_TEMPLATE = reverse('recipe:ingredient-detail', args=[0]).replace('/0/', '/{}/')
 
 
 def detail_url(ingredient_id):
     """
     Create and return an ingredient detail URL
     """
-    return reverse('recipe:ingredient-detail', args=[ingredient_id])
+    return INGREDIENT_DETAIL_URL_TEMPLATE.format(ingredient_id)
 
 
 def create_user(email='user@example.com', password='testpass123'):
@@ -26,13 +27,12 @@ def create_user(email='user@example.com', password='testpass123'):
     return get_user_model().objects.create_user(email, password)
 
 
-class PublicIngredientsAPITests(TestCase):
+class PublicIngredientsAPITests(SimpleTestCase):
     """
     Test unauthenticated API requests
     """
-
-    def setUp(self):
-        self.client = APIClient()
+    databases = set()
+    client_class = APIClient
 
     def test_auth_required(self):
         """
@@ -46,17 +46,23 @@ class PrivateIngredientsAPITests(TestCase):
     """
     Test authenticated API requests
     """
+    client_class = APIClient
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user()
+
     def setUp(self):
-        self.user = create_user()
-        self.client = APIClient()
         self.client.force_authenticate(self.user)
 
     def test_retrieve_ingredients(self):
         """
         Test retrieving a list of ingredients
         """
-        Ingredient.objects.create(user=self.user, name='Kale')
-        Ingredient.objects.create(user=self.user, name='Vanilla')
+        Ingredient.objects.bulk_create([
+            Ingredient(user=self.user, name='Kale'),
+            Ingredient(user=self.user, name='Vanilla'),
+        ])
 
         response = self.client.get(INGREDIENTS_URL)
         ingredients = Ingredient.objects.all().order_by('-name')
@@ -102,8 +108,7 @@ class PrivateIngredientsAPITests(TestCase):
         response = self.client.delete(url)
 
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
-        ingredents = Ingredient.objects.filter(user=self.user)
-        self.assertFalse(ingredents.exists())
+        self.assertFalse(Ingredient.objects.filter(pk=ingredent.pk).exists())
 
     def test_filter_ingredients_assigned_to_recipes(self):
         """
@@ -119,10 +124,9 @@ class PrivateIngredientsAPITests(TestCase):
         )
         recipe.ingredients.add(ing1)
         response = self.client.get(INGREDIENTS_URL, {'assigned_only': 1})
-        s1 = IngredientSerializer(ing1)
-        s2 = IngredientSerializer(ing2)
-        self.assertIn(s1.data, response.data)
-        self.assertNotIn(s2.data, response.data)
+        s1, s2 = IngredientSerializer([ing1, ing2], many=True).data
+        self.assertIn(s1, response.data)
+        self.assertNotIn(s2, response.data)
 
     def test_filtered_ingredients_unique(self):
         """
@@ -3,7 +3,7 @@ Tests for recipe APIs
 """
 from decimal import Decimal
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.test import SimpleTestCase, TestCase
 from django.urls import reverse
 
 from rest_framework import status
@@ -13,14 +13,18 @@ from core.models import Recipe, Tag, Ingredient
 
 from recipe.serializers import RecipeSerializer, RecipeDetailSerializer
 
+User = get_user_model()
+
 RECIPES_URL = reverse('recipe:recipe-list')
+# reversed once with a placeholder id so detail_url doesn't walk the URLconf on every call
+RECIPE_DETAIL_URL_TEMPLATE = reverse('recipe:recipe-detail', args=[0]).replace('/0/', '/{}/')
 
 
 def detail_url(recipe_id):
     """
     Create and return a recipe detail URL
     """
-    return reverse('recipe:recipe-detail', args=[recipe_id])
+    return RECIPE_DETAIL_URL_TEMPLATE.format(recipe_id)
 
 
 def create_recipe(user, **params):
@@ -39,12 +43,12 @@ def create_recipe(user, **params):
     return recipe
 
 
-class PublicRecipeAPITests(TestCase):
+class PublicRecipeAPITests(SimpleTestCase):
     """
     Test unauthenticated API requests
     """
-    def setUp(self):
-        self.client = APIClient()
+    databases = set()
+    client_class = APIClient
 
     def test_auth_required(self):
         """
@@ -58,12 +62,16 @@ class PrivateRecipeAPITests(TestCase):
     """
     Test authenticated API Requests
     """
-    def setUp(self):
-        self.client = APIClient()
-        self.user = get_user_model().objects.create_user(
+    client_class = APIClient
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
             'user@example.com',
             'testpass123'
         )
+
+    def setUp(self):
         self.client.force_authenticate(self.user)
 
     def test_retrieve_recipes(self):
@@ -80,11 +88,28 @@ class PrivateRecipeAPITests(TestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data, serializer.data)
 
+    def test_retrieve_recipes_query_count(self):
+        """
+        Test listing recipes doesn't query tags and ingredients once per recipe
+        """
+        tag = Tag.objects.create(user=self.user, name='Vegan')
+        ingredient = Ingredient.objects.create(user=self.user, name='Kale')
+        for _ in range(3):
+            recipe = create_recipe(user=self.user)
+            recipe.tags.add(tag)
+            recipe.ingredients.add(ingredient)
+
+        # one query for the recipes, then one prefetch each for tags and ingredients
+        with self.assertNumQueries(3):
+            response = self.client.get(RECIPES_URL)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 3)
+
     def test_recipe_list_limited_to_user(self):
         """
         Test list of recipes is limited to the authenticated user
         """
-        other_user = get_user_model().objects.create_user(
+        other_user = User.objects.create_user(
             'other@example.com',
             'testpass124'
         )
@@ -120,7 +145,7 @@ class PrivateRecipeAPITests(TestCase):
         recipe = Recipe.objects.get(id=response.data['id'])
         for k, v in payload.items():
             self.assertEqual(getattr(recipe, k), v)
-        self.assertEqual(recipe.user, self.user)
+        self.assertEqual(recipe.user_id, self.user.id)
 
     def test_create_recipe_with_new_tags(self):
         """
@@ -136,13 +161,10 @@ class PrivateRecipeAPITests(TestCase):
         recipes = Recipe.objects.filter(user=self.user)
         self.assertEqual(recipes.count(), 1)
         recipe = recipes[0]
-        self.assertEqual(recipe.tags.count(), 2)
-        for tag in payload['tags']:
-            exists = recipe.tags.filter(
-                name=tag['name'],
-                user=self.user
-            ).exists()
-            self.assertTrue(exists)
+        self.assertCountEqual(
+            recipe.tags.values_list('name', 'user'),
+            [(tag['name'], self.user.id) for tag in payload['tags']]
+        )
 
     def test_create_recipe_with_existing_tags(self):
         """
@@ -161,14 +183,11 @@ class PrivateRecipeAPITests(TestCase):
         recipes = Recipe.objects.filter(user=self.user)
         self.assertEqual(recipes.count(), 1)
         recipe = recipes[0]
-        self.assertEqual(recipe.tags.count(), 2)
-        self.assertIn(tag_indian, recipe.tags.all())
-        for tag in payload['tags']:
-            exists = recipe.tags.filter(
-                name=tag['name'],
-                user=self.user
-            ).exists()
-            self.assertTrue(exists)
+        self.assertTrue(recipe.tags.filter(pk=tag_indian.pk).exists())
+        self.assertCountEqual(
+            recipe.tags.values_list('name', 'user'),
+            [(tag['name'], self.user.id) for tag in payload['tags']]
+        )
 
     def test_create_tag_on_update(self):
         """
@@ -182,8 +201,8 @@ class PrivateRecipeAPITests(TestCase):
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         new_tag = Tag.objects.get(user=self.user, name='Lunch')
-        # calling tags.all() makes a new query, so no need to refresh from DB
-        self.assertIn(new_tag, recipe.tags.all())
+        # filtering tags makes a new query, so no need to refresh from DB
+        self.assertTrue(recipe.tags.filter(pk=new_tag.pk).exists())
 
     def test_update_recipe_assign_tag(self):
         """
@@ -192,7 +211,7 @@ class PrivateRecipeAPITests(TestCase):
         tag = Tag.objects.create(user=self.user, name='Breakfast')
         recipe = create_recipe(user=self.user)
         recipe.tags.add(tag)
-        self.assertIn(tag, recipe.tags.all())
+        self.assertTrue(recipe.tags.filter(pk=tag.pk).exists())
 
         tag_lunch = Tag.objects.create(user=self.user, name='Lunch')
         payload = {'tags': [{'name': 'Lunch'}]}
@@ -201,9 +220,10 @@ class PrivateRecipeAPITests(TestCase):
         response = self.client.patch(url, payload, format='json')
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        # calling tags.all() makes a new query, so no need to refresh from DB
-        self.assertIn(tag_lunch, recipe.tags.all())
-        self.assertNotIn(tag, recipe.tags.all())
+        # querying tags hits the DB again, so no need to refresh from DB
+        tag_ids = set(recipe.tags.values_list('pk', flat=True))
+        self.assertIn(tag_lunch.pk, tag_ids)
+        self.assertNotIn(tag.pk, tag_ids)
 
     def test_clear_recipe_tags(self):
         """
@@ -212,7 +232,7 @@ class PrivateRecipeAPITests(TestCase):
         tag = Tag.objects.create(user=self.user, name='Breakfast')
         recipe = create_recipe(user=self.user)
         recipe.tags.add(tag)
-        self.assertIn(tag, recipe.tags.all())
+        self.assertTrue(recipe.tags.filter(pk=tag.pk).exists())
 
         payload = {'tags': []}
         url = detail_url(recipe.id)
@@ -220,7 +240,7 @@ class PrivateRecipeAPITests(TestCase):
         response = self.client.patch(url, payload, format='json')
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertNotIn(tag, recipe.tags.all())
+        self.assertFalse(recipe.tags.filter(pk=tag.pk).exists())
 
     def test_create_recipe_with_new_ingredients(self):
         """
@@ -237,13 +257,10 @@ class PrivateRecipeAPITests(TestCase):
         recipes = Recipe.objects.filter(user=self.user)
         self.assertEqual(recipes.count(), 1)
         recipe = recipes[0]
-        self.assertEqual(recipe.ingredients.count(), 2)
-        for ingredient in payload['ingredients']:
-            exists = recipe.ingredients.filter(
-                name=ingredient['name'],
-                user=self.user
-            ).exists()
-            self.assertTrue(exists)
+        self.assertCountEqual(
+            recipe.ingredients.values_list('name', 'user'),
+            [(ingredient['name'], self.user.id) for ingredient in payload['ingredients']]
+        )
 
     def test_create_recipe_with_existing_ingredient(self):
         """
@@ -262,14 +279,11 @@ class PrivateRecipeAPITests(TestCase):
         recipes = Recipe.objects.filter(user=self.user)
         self.assertEqual(recipes.count(), 1)
         recipe = recipes[0]
-        self.assertEqual(recipe.ingredients.count(), 2)
-        self.assertIn(ingredient_beans, recipe.ingredients.all())
-        for ingredient in payload['ingredients']:
-            exists = recipe.ingredients.filter(
-                name=ingredient['name'],
-                user=self.user
-            ).exists()
-            self.assertTrue(exists)
+        self.assertTrue(recipe.ingredients.filter(pk=ingredient_beans.pk).exists())
+        self.assertCountEqual(
+            recipe.ingredients.values_list('name', 'user'),
+            [(ingredient['name'], self.user.id) for ingredient in payload['ingredients']]
+        )
 
     def test_create_ingredient_on_update(self):
         """
@@ -283,8 +297,8 @@ class PrivateRecipeAPITests(TestCase):
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         new_ingredient = Ingredient.objects.get(user=self.user, name='Cucumber')
-        # calling ingredients.all() makes a new query, so no need to refresh from DB
-        self.assertIn(new_ingredient, recipe.ingredients.all())
+        # filtering ingredients makes a new query, so no need to refresh from DB
+        self.assertTrue(recipe.ingredients.filter(pk=new_ingredient.pk).exists())
 
     def test_update_recipe_assign_ingredient(self):
         """
@@ -293,7 +307,7 @@ class PrivateRecipeAPITests(TestCase):
         ingredient = Ingredient.objects.create(user=self.user, name='Lamb Mince')
         recipe = create_recipe(user=self.user)
         recipe.ingredients.add(ingredient)
-        self.assertIn(ingredient, recipe.ingredients.all())
+        self.assertTrue(recipe.ingredients.filter(pk=ingredient.pk).exists())
 
         ingredient_beef = Ingredient.objects.create(user=self.user, name='Beef Mince')
         payload = {'ingredients': [{'name': 'Beef Mince'}]}
@@ -302,9 +316,10 @@ class PrivateRecipeAPITests(TestCase):
         response = self.client.patch(url, payload, format='json')
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        # calling ingredients.all() makes a new query, so no need to refresh from DB
-        self.assertIn(ingredient_beef, recipe.ingredients.all())
-        self.assertNotIn(ingredient, recipe.ingredients.all())
+        # querying ingredients hits the DB again, so no need to refresh from DB
+        ingredient_ids = set(recipe.ingredients.values_list('pk', flat=True))
+        self.assertIn(ingredient_beef.pk, ingredient_ids)
+        self.assertNotIn(ingredient.pk, ingredient_ids)
 
     def test_clear_recipe_ingredientss(self):
         """
@@ -313,7 +328,7 @@ class PrivateRecipeAPITests(TestCase):
         ingredient = Ingredient.objects.create(user=self.user, name='Breakfast')
         recipe = create_recipe(user=self.user)
         recipe.ingredients.add(ingredient)
-        self.assertIn(ingredient, recipe.ingredients.all())
+        self.assertTrue(recipe.ingredients.filter(pk=ingredient.pk).exists())
 
         payload = {'ingredients': []}
         url = detail_url(recipe.id)
@@ -321,7 +336,7 @@ class PrivateRecipeAPITests(TestCase):
         response = self.client.patch(url, payload, format='json')
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertNotIn(ingredient, recipe.ingredients.all())
+        self.assertFalse(recipe.ingredients.filter(pk=ingredient.pk).exists())
 
     def test_filter_by_tags(self):
         """
@@ -339,12 +354,13 @@ class PrivateRecipeAPITests(TestCase):
         response = self.client.get(RECIPES_URL, params)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        s1 = RecipeSerializer(r1)
-        s2 = RecipeSerializer(r2)
-        s3 = RecipeSerializer(r3)
-        self.assertIn(s1.data, response.data)
-        self.assertIn(s2.data, response.data)
-        self.assertNotIn(s3.data, response.data)
+        recipes = Recipe.objects.filter(
+            id__in=[r1.id, r2.id, r3.id]
+        ).order_by('id').prefetch_related('tags', 'ingredients')
+        s1, s2, s3 = RecipeSerializer(recipes, many=True).data
+        self.assertIn(s1, response.data)
+        self.assertIn(s2, response.data)
+        self.assertNotIn(s3, response.data)
 
     def test_filter_by_ingredients(self):
         """
@@ -362,9 +378,10 @@ class PrivateRecipeAPITests(TestCase):
         response = self.client.get(RECIPES_URL, params)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        s1 = RecipeSerializer(r1)
-        s2 = RecipeSerializer(r2)
-        s3 = RecipeSerializer(r3)
-        self.assertIn(s1.data, response.data)
-        self.assertIn(s2.data, response.data)
-        self.assertNotIn(s3.data, response.data)
+        recipes = Recipe.objects.filter(
+            id__in=[r1.id, r2.id, r3.id]
+        ).order_by('id').prefetch_related('tags', 'ingredients')
+        s1, s2, s3 = RecipeSerializer(recipes, many=True).data
+        self.assertIn(s1, response.data)
+        self.assertIn(s2, response.data)
+        self.assertNotIn(s3, response.data)
@@ -4,7 +4,7 @@ Tests for the tags API
 from decimal import Decimal
 from django.contrib.auth import get_user_model
 from django.urls import reverse
-from django.test import TestCase
+from django.test import SimpleTestCase, TestCase
 
 from rest_framework import status
 from rest_framework.test import APIClient
@@ -13,13 +13,14 @@ from core.models import Recipe, Tag
 from recipe.serializers import TagSerializer
 
 TAGS_URL = reverse('recipe:tag-list')
+TAG_DETAIL_URL_TEMPLATE = reverse('recipe:tag-detail', args=[0]).replace('/0/', '/{}/')
 
 
 def detail_url(tag_id):
     """
     Create and return a tag detail URL
     """
-    return reverse('recipe:tag-detail', args=[tag_id])
+    return TAG_DETAIL_URL_TEMPLATE.format(tag_id)
 
 
 def create_user(email='user@example.com', password='testpass123'):
@@ -29,13 +30,12 @@ def create_user(email='user@example.com', password='testpass123'):
     return get_user_model().objects.create_user(email, password)
 
 
-class PublicTagsAPITests(TestCase):
+class PublicTagsAPITests(SimpleTestCase):
     """
     Test unauthenticated API requests
     """
-
-    def setUp(self):
-        self.client = APIClient()
+    databases = set()
+    client_class = APIClient
 
     def test_auth_required(self):
         """
@@ -49,17 +49,23 @@ class PrivateTagsAPITests(TestCase):
     """
     Test authenticated API requests
     """
+    client_class = APIClient
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user()
+
     def setUp(self):
-        self.user = create_user()
-        self.client = APIClient()
         self.client.force_authenticate(self.user)
 
     def test_retrieve_tags(self):
         """
         Test retrieving a list of tags
         """
-        Tag.objects.create(user=self.user, name='Vegan')
-        Tag.objects.create(user=self.user, name='Dessert')
+        Tag.objects.bulk_create([
+            Tag(user=self.user, name='Vegan'),
+            Tag(user=self.user, name='Dessert'),
+        ])
 
         response = self.client.get(TAGS_URL)
 
@@ -106,8 +112,7 @@ class PrivateTagsAPITests(TestCase):
         response = self.client.delete(url)
 
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
-        tags = Tag.objects.filter(user=self.user)
-        self.assertFalse(tags.exists())
+        self.assertFalse(Tag.objects.filter(pk=tag.pk).exists())
 
     def test_filter_tags_assigned_to_recipes(self):
         """
@@ -123,10 +128,9 @@ class PrivateTagsAPITests(TestCase):
         )
         recipe.tags.add(tag1)
         response = self.client.get(TAGS_URL, {'assigned_only': 1})
-        s1 = TagSerializer(tag1)
-        s2 = TagSerializer(tag2)
-        self.assertIn(s1.data, response.data)
-        self.assertNotIn(s2.data, response.data)
+        s1, s2 = TagSerializer([tag1, tag2], many=True).data
+        self.assertIn(s1, response.data)
+        self.assertNotIn(s2, response.data)
 
     def test_filtered_tags_unique(self):
         """
@@ -6,13 +6,15 @@ from django.utils.translation import gettext as _
 
 from rest_framework import serializers
 
+User = get_user_model()
+
 
 class UserSerializer(serializers.ModelSerializer):
     """
     Serializer for the user object
     """
     class Meta:
-        model = get_user_model()
+        model = User
         fields = ['email', 'password', 'name']
         # write_only is so the user cannot read the pw value. The min length is for pw security
         extra_kwargs = {'password': {'write_only': True, 'min_length': 5}}
@@ -22,7 +24,7 @@ class UserSerializer(serializers.ModelSerializer):
         """
         Create and return a user with an encrypted password
         """
-        return get_user_model().objects.create_user(**validated_data)
+        return User.objects.create_user(**validated_data)
 
     def update(self, instance, validated_data):
         """
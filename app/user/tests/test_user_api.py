@@ -1,89 +1,117 @@
 """
 Tests for the user API
 """
-from django.test import TestCase
+from types import MappingProxyType
+from unittest.mock import patch
+
+from django.test import SimpleTestCase, TestCase
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
 from django.urls import reverse
 
-from rest_framework.test import APIClient
+from rest_framework.test import APIClient, APIRequestFactory
 from rest_framework import status
 
+from user.serializers import AuthTokenSerializer
+from user.views import CreateUserView, CreateTokenView
+
+User = get_user_model()
+
 CREATE_USER_URL = reverse('user:create')
 TOKEN_URL = reverse('user:token')
 ME_URL = reverse('user:me')
 
+# read-only so a test can't change the payload seen by later tests; copy it to vary a field
+DEFAULT_PAYLOAD = MappingProxyType({
+    'email': 'test@example.com',
+    'password': 'testpass123',
+    'name': 'Silly Sally'
+})
+# hashed once and reused by every user created with the default password
+HASHED_DEFAULT_PASSWORD = make_password(DEFAULT_PAYLOAD['password'])
+
 
 def create_user(**params):
     """
     Create and return a new user
     """
-    return get_user_model().objects.create_user(**params)
+    password = params.pop('password', None)
+    if password != DEFAULT_PAYLOAD['password']:
+        return User.objects.create_user(password=password, **params)
+
+    # same checks as UserManager.create_user, but the cached hash goes into the single INSERT
+    email = params.pop('email', None)
+    if not email:
+        raise ValueError('User must have an email address!')
+    user = User(email=User.objects.normalize_email(email), password=HASHED_DEFAULT_PASSWORD, **params)
+    user.save()
+    return user
 
 
 class PublicUserApiTests(TestCase):
     """
     Test public features of the user API
     """
+    client_class = APIClient
+
     def setUp(self):
-        self.client = APIClient()
+        # validation-only tests call the view directly, skipping URL routing and middleware
+        self.factory = APIRequestFactory()
 
     def test_create_user_success(self):
         """
         Test that creating a user is successful
         """
-        payload = {
-            'email': 'test@example.com',
-            'password': 'testpass123',
-            'name': 'Silly Sally'
-        }
+        payload = DEFAULT_PAYLOAD
         # assert the user is correctly created
         response = self.client.post(CREATE_USER_URL, payload)
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
 
         # make sure the created user has the same password as the payload
-        user = get_user_model().objects.get(email=payload['email'])
+        user = User.objects.only('password').get(email=payload['email'])
         self.assertTrue(user.check_password(payload['password']))
 
         # Ensure the pw field is not returned as part of the response
         self.assertNotIn('password', response.data)
 
+    def test_create_user_ignores_authorization_header(self):
+        """
+        Test signing up isn't rejected by a malformed Authorization header, as the endpoint runs no authenticators
+        """
+        response = self.client.post(CREATE_USER_URL, DEFAULT_PAYLOAD, HTTP_AUTHORIZATION='Basic not-base64')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
     def test_user_with_email_exists_error(self):
         """
         Test an error is returned if a user with the same email exists
         """
-        payload = {
-            'email': 'test@example.com',
-            'password': 'testpass123',
-            'name': 'Silly Sally'
-        }
+        payload = DEFAULT_PAYLOAD
         create_user(**payload)
         response = self.client.post(CREATE_USER_URL, payload)
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
-    def test_password_too_short_error(self):
+    def test_create_user_invalid_payload_error(self):
         """
-        Test an error is returned if a password is less htna 5 chars
+        Test an error is returned and no user is created for an invalid payload
         """
-        payload = {
-            'email': 'test@example.com',
-            'password': 'test',
-            'name': 'Silly Sally'
-        }
-        # assert the user is correctly created
-        response = self.client.post(CREATE_USER_URL, payload)
-        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
-        user_exists = get_user_model().objects.filter(email=payload['email']).exists()
-        self.assertFalse(user_exists)
+        invalid_payloads = [
+            {**DEFAULT_PAYLOAD, 'password': 'test'},
+            {**DEFAULT_PAYLOAD, 'email': ''},
+            {**DEFAULT_PAYLOAD, 'email': 'not-an-email'},
+            {**DEFAULT_PAYLOAD, 'name': ''},
+        ]
+        for payload in invalid_payloads:
+            with self.subTest(payload=payload):
+                request = self.factory.post(CREATE_USER_URL, payload)
+                response = CreateUserView.as_view()(request)
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertFalse(User.objects.exists())
 
     def test_create_token_for_user(self):
         """
         Test generates token for valid credentials
         """
-        user_details = {
-            'email': 'test@example.com',
-            'password': 'testpass123',
-            'name': 'Silly Sally'
-        }
+        user_details = DEFAULT_PAYLOAD
         create_user(**user_details)
 
         payload = {
@@ -100,49 +128,103 @@ class PublicUserApiTests(TestCase):
         """
         Test returns error if invalid credentials provided
         """
-        user_details = {
-            'email': 'test@example.com',
-            'password': 'testpass123',
-            'name': 'Silly Sally'
-        }
-        create_user(**user_details)
+        # one user shared by every case, so its password is only stored once
+        create_user(**DEFAULT_PAYLOAD)
 
-        payload = {
-            'email': user_details['email'],
-            'password': 'badpass',
+        bad_credentials = [
+            {'email': DEFAULT_PAYLOAD['email'], 'password': 'badpass'},
+            {'email': 'other@example.com', 'password': DEFAULT_PAYLOAD['password']},
+        ]
+        for payload in bad_credentials:
+            with self.subTest(payload=payload):
+                request = self.factory.post(TOKEN_URL, payload)
+                response = CreateTokenView.as_view()(request)
+                self.assertNotIn('token', response.data)
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
-        }
-        response = self.client.post(TOKEN_URL, payload)
-        self.assertNotIn('token', response.data)
-        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+    def test_retrieve_user_unauthorized(self):
+        """
+        Test auth is required for users
+        """
+        response = self.client.get(ME_URL)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class TokenValidationTests(SimpleTestCase):
+    """
+    Test token requests that are rejected before touching the database
+    """
+    databases = set()
+
+    def setUp(self):
+        self.factory = APIRequestFactory()
 
     def test_create_token_blank_password(self):
         """
         Test that posting a blank password returns an error
         """
         payload = {'email': 'test@example.com', 'password': ''}
-        response = self.client.post(TOKEN_URL, payload)
+        request = self.factory.post(TOKEN_URL, payload)
+        response = CreateTokenView.as_view()(request)
 
         self.assertNotIn('token', response.data)
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
-    def test_retrieve_user_unauthorized(self):
+
+@patch('user.serializers.authenticate')
+class AuthTokenSerializerTests(SimpleTestCase):
+    """
+    Test the auth token serializer with authentication mocked out, so no password is hashed
+    """
+    databases = set()
+
+    def setUp(self):
+        self.request = APIRequestFactory().post(TOKEN_URL)
+        self.payload = {
+            'email': DEFAULT_PAYLOAD['email'],
+            'password': DEFAULT_PAYLOAD['password'],
+        }
+
+    def test_valid_credentials_return_user(self, patched_authenticate):
         """
-        Test auth is required for users
+        Test the authenticated user is added to the validated data
         """
-        response = self.client.get(ME_URL)
-        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        user = User(email=DEFAULT_PAYLOAD['email'])
+        patched_authenticate.return_value = user
+        serializer = AuthTokenSerializer(data=self.payload, context={'request': self.request})
+
+        self.assertTrue(serializer.is_valid())
+        self.assertIs(serializer.validated_data['user'], user)
+        patched_authenticate.assert_called_once_with(
+            request=self.request,
+            username=self.payload['email'],
+            password=self.payload['password'],
+        )
+
+    def test_failed_authentication_is_invalid(self, patched_authenticate):
+        """
+        Test an error is returned if the credentials don't authenticate
+        """
+        patched_authenticate.return_value = None
+        serializer = AuthTokenSerializer(data=self.payload, context={'request': self.request})
+
+        self.assertFalse(serializer.is_valid())
+        self.assertIn('non_field_errors', serializer.errors)
 
 
 class PrivateUserApiTests(TestCase):
     """
     Test API requests that require authentication
     """
+    client_class = APIClient
+
+    @classmethod
+    def setUpTestData(cls):
+        # none of these tests log in with a password, so skip hashing one
+        cls.user = create_user(email='test@example.com',
+                               name='Silly Sally')
+
     def setUp(self):
-        self.user = create_user(email='test@example.com',
-                                password='testpass123',
-                                name='Silly Sally')
-        self.client = APIClient()
         # Any request made with this client will use the specified user from now on
         self.client.force_authenticate(user=self.user)
 
@@ -14,6 +14,8 @@ class CreateUserView(generics.CreateAPIView):
     Create a new user in the system
     """
     serializer_class = UserSerializer
+    # signing up is anonymous, so don't run the default session/basic authenticators on every request
+    authentication_classes = []
 
 
 class CreateTokenView(ObtainAuthToken):